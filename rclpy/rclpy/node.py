@@ -77,6 +77,10 @@ from rclpy.waitable import Waitable
 
 HIDDEN_NODE_PREFIX = '_'
 
+# Shared result for the internal descriptor checks that pass.
+# It is never handed to users, who always get a result of their own.
+_SUCCESSFUL_CHECK_RESULT = SetParametersResult(successful=True)
+
 # Used for documentation purposes only
 MsgType = TypeVar('MsgType')
 SrvType = TypeVar('SrvType')
@@ -163,6 +167,12 @@ class Node:
             raise RuntimeError('rclpy_create_node failed for unknown reason')
         with self.handle as capsule:
             self._logger = get_logger(_rclpy.rclpy_get_node_logger_name(capsule))
+        # The name and namespace can't change after creation, so the fully qualified name
+        # used in parameter events is built once instead of once per parameter set.
+        if self.get_namespace() == '/':
+            self._parameter_event_node_name = '/' + self.get_name()
+        else:
+            self._parameter_event_node_name = self.get_namespace() + '/' + self.get_name()
 
         # Clock that has support for ROS time.
         self._clock = ROSClock()
@@ -301,7 +311,7 @@ class Node:
         self,
         name: str,
         value: Any = None,
-        descriptor: ParameterDescriptor = ParameterDescriptor()
+        descriptor: Optional[ParameterDescriptor] = None
     ) -> Parameter:
         """
         Declare and initialize a parameter.
@@ -312,11 +322,15 @@ class Node:
         :param name: Fully-qualified name of the parameter, including its namespace.
         :param value: Value of the parameter to declare.
         :param descriptor: Descriptor for the parameter to declare.
+            If None, a default descriptor is used.
         :return: Parameter with the effectively assigned value.
         :raises: ParameterAlreadyDeclaredException if the parameter had already been declared.
         :raises: InvalidParameterException if the parameter name is invalid.
         :raises: InvalidParameterValueException if the registered callback rejects the parameter.
         """
+        if descriptor is None:
+            # The node stores and updates the descriptor, so each parameter needs its own.
+            descriptor = ParameterDescriptor()
         return self.declare_parameters('', [(name, value, descriptor)])[0]
 
     def declare_parameters(
@@ -370,7 +384,7 @@ class Node:
                 )
 
             value = None
-            descriptor = ParameterDescriptor()
+            descriptor = None
 
             # Get the values from the tuple, checking its types.
             # Use defaults if the tuple doesn't contain value and / or descriptor.
@@ -404,6 +418,10 @@ class Node:
                 # This means either value or descriptor were not defined which is fine.
                 pass
 
+            if descriptor is None:
+                # Only build a default descriptor when the tuple didn't provide one.
+                descriptor = ParameterDescriptor()
+
             if namespace:
                 name = '{namespace}.{name}'.format_map(locals())
 
@@ -627,11 +645,14 @@ class Node:
         if not all(isinstance(parameter, Parameter) for parameter in parameter_list):
             raise TypeError("parameter must be instance of type '{}'".format(repr(Parameter)))
 
-        undeclared_parameters = (
+        if self._allow_undeclared_parameters:
+            return
+
+        undeclared_parameters = [
             param.name for param in parameter_list if param.name not in self._parameters
-        )
-        if (not self._allow_undeclared_parameters and any(undeclared_parameters)):
-            raise ParameterNotDeclaredException(list(undeclared_parameters))
+        ]
+        if undeclared_parameters:
+            raise ParameterNotDeclaredException(undeclared_parameters)
 
     def _set_parameters_atomically(
         self,
@@ -678,10 +699,7 @@ class Node:
         if result.successful:
             parameter_event = ParameterEvent()
             # Add fully qualified path of node to parameter event
-            if self.get_namespace() == '/':
-                parameter_event.node = self.get_namespace() + self.get_name()
-            else:
-                parameter_event.node = self.get_namespace() + '/' + self.get_name()
+            parameter_event.node = self._parameter_event_node_name
 
             for param in parameter_list:
                 # If parameters without type and value are not allowed, they shall be undeclared.
@@ -702,7 +720,11 @@ class Node:
                     elif param.name not in self._descriptors:
                         self._descriptors[param.name] = ParameterDescriptor()
 
-                    if Parameter.Type.NOT_SET == self.get_parameter_or(param.name).type_:
+                    previous_parameter = self._parameters.get(param.name)
+                    if (
+                        previous_parameter is None or
+                        Parameter.Type.NOT_SET == previous_parameter.type_
+                    ):
                         #  Parameter is new. (Parameter had no value and new value is set)
                         parameter_event.new_parameters.append(param.to_parameter_msg())
                     else:
@@ -741,7 +763,7 @@ class Node:
                 result = self._apply_descriptor(param, descriptors[param.name], check_read_only)
                 if not result.successful:
                     return result
-        return SetParametersResult(successful=True)
+        return _SUCCESSFUL_CHECK_RESULT
 
     def _apply_descriptor(
         self,
@@ -776,13 +798,26 @@ class Node:
                 successful=False,
                 reason='Trying to set a read-only parameter: {}.'.format(parameter.name))
 
+        # When a parameter is set again to its stored value with its stored descriptor, that
+        # value has already passed the range checks. New descriptors (declaring a parameter or
+        # calling set_descriptor) are always checked in full.
+        previous_parameter = self._parameters.get(parameter.name)
+        if (
+            check_read_only and
+            previous_parameter is not None and
+            descriptor is self._descriptors.get(parameter.name) and
+            previous_parameter.type_ == parameter.type_ and
+            previous_parameter.value == parameter.value
+        ):
+            return _SUCCESSFUL_CHECK_RESULT
+
         if parameter.type_ == Parameter.Type.INTEGER and descriptor.integer_range:
             return self._apply_integer_range(parameter, descriptor.integer_range[0])
 
         if parameter.type_ == Parameter.Type.DOUBLE and descriptor.floating_point_range:
             return self._apply_floating_point_range(parameter, descriptor.floating_point_range[0])
 
-        return SetParametersResult(successful=True)
+        return _SUCCESSFUL_CHECK_RESULT
 
     def _apply_integer_range(
         self,
@@ -794,7 +829,7 @@ class Node:
 
         # Values in the edge are always OK.
         if parameter.value == min_value or parameter.value == max_value:
-            return SetParametersResult(successful=True)
+            return _SUCCESSFUL_CHECK_RESULT
 
         if not min_value < parameter.value < max_value:
             return SetParametersResult(
@@ -818,7 +853,7 @@ class Node:
                         )
             )
 
-        return SetParametersResult(successful=True)
+        return _SUCCESSFUL_CHECK_RESULT
 
     def _apply_floating_point_range(
         self,
@@ -833,7 +868,7 @@ class Node:
             math.isclose(parameter.value, min_value, rel_tol=self.PARAM_REL_TOL) or
             math.isclose(parameter.value, max_value, rel_tol=self.PARAM_REL_TOL)
         ):
-            return SetParametersResult(successful=True)
+            return _SUCCESSFUL_CHECK_RESULT
 
         if not min_value < parameter.value < max_value:
             return SetParametersResult(
@@ -863,7 +898,7 @@ class Node:
                             )
                 )
 
-        return SetParametersResult(successful=True)
+        return _SUCCESSFUL_CHECK_RESULT
 
     def _apply_descriptor_and_set(
         self,
@@ -908,11 +943,7 @@ class Node:
         :raises: ParameterNotDeclaredException if at least one parameter
             had not been declared before and undeclared parameters are not allowed.
         """
-        parameter_descriptors = []
-        for name in names:
-            parameter_descriptors.append(self.describe_parameter(name))
-
-        return parameter_descriptors
+        return [self.describe_parameter(name) for name in names]
 
     def set_descriptor(
         self,
@@ -22,6 +22,12 @@ PARAMETER_SEPARATOR_STRING = '.'
 
 class Parameter:
 
+    __slots__ = [
+        '_type_',
+        '_name',
+        '_value',
+    ]
+
     class Type(Enum):
         NOT_SET = ParameterType.PARAMETER_NOT_SET
         BOOL = ParameterType.PARAMETER_BOOL
@@ -42,8 +48,11 @@ class Parameter:
             :return: A Parameter.Type corresponding to the instance type of the given value.
             :raises: TypeError if the conversion to a type was not possible.
             """
-            if parameter_value is None:
-                return Parameter.Type.NOT_SET
+            # Values of the exact scalar types are looked up directly.
+            # Subclasses of those types fall through to the isinstance() checks below.
+            parameter_type = _SCALAR_PARAMETER_TYPES.get(type(parameter_value))
+            if parameter_type is not None:
+                return parameter_type
             elif isinstance(parameter_value, bool):
                 return Parameter.Type.BOOL
             elif isinstance(parameter_value, int):
@@ -171,3 +180,12 @@ class Parameter:
 
     def to_parameter_msg(self):
         return ParameterMsg(name=self.name, value=self.get_parameter_value())
+
+
+_SCALAR_PARAMETER_TYPES = {
+    type(None): Parameter.Type.NOT_SET,
+    bool: Parameter.Type.BOOL,
+    int: Parameter.Type.INTEGER,
+    float: Parameter.Type.DOUBLE,
+    str: Parameter.Type.STRING,
+}
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+import time
 import unittest
 from unittest.mock import Mock
+from unittest.mock import patch
 import warnings
 
+import pytest
 from rcl_interfaces.msg import FloatingPointRange
 from rcl_interfaces.msg import IntegerRange
 from rcl_interfaces.msg import ParameterDescriptor
@@ -33,6 +37,8 @@ from rclpy.exceptions import ParameterAlreadyDeclaredException
 from rclpy.exceptions import ParameterImmutableException
 from rclpy.exceptions import ParameterNotDeclaredException
 from rclpy.executors import SingleThreadedExecutor
+from rclpy.impl.implementation_singleton import rclpy_implementation as _rclpy
+from rclpy.node import Node
 from rclpy.parameter import Parameter
 from rclpy.qos import qos_profile_default
 from rclpy.qos import qos_profile_sensor_data
@@ -41,21 +47,75 @@ from test_msgs.msg import BasicTypes
 TEST_NODE = 'my_node'
 TEST_NAMESPACE = '/my_ns'
 
+# Parameters are immutable, so these can be shared between tests.
+FOO_PARAMETER = Parameter('foo', Parameter.Type.INTEGER, 42)
+BAR_PARAMETER = Parameter('bar', Parameter.Type.STRING, 'hello')
+BAZ_PARAMETER = Parameter('baz', Parameter.Type.DOUBLE, 2.41)
+
+# Only used for comparisons; the node modifies descriptors that are passed to it.
+EMPTY_DESCRIPTOR = ParameterDescriptor()
+# Never stored by the node, so it can be shared between tests.
+EMPTY_PARAMETER_VALUE = ParameterValue()
+
+
+# Initialized contexts, keyed by the arguments given to rclpy.init.
+_contexts = {}
+
+
+def _get_context(args=None):
+    # Test classes that use the same init arguments share a single context.
+    if args not in _contexts:
+        context = rclpy.context.Context()
+        rclpy.init(args=None if args is None else list(args), context=context)
+        _contexts[args] = context
+    return _contexts[args]
+
+
+def tearDownModule():
+    for context in _contexts.values():
+        rclpy.shutdown(context=context)
+    _contexts.clear()
+
+
+class _StopEntityCreation(Exception):
+    pass
+
+
+def ignore_message(msg):
+    # Shared subscription callback for tests that don't look at the messages.
+    pass
+
+
+def get_parameter_values(node, names):
+    return {parameter.name: parameter.value for parameter in node.get_parameters(names)}
+
 
 class TestNodeAllowUndeclaredParameters(unittest.TestCase):
 
+    _RE_NAME_CHARS = re.compile('must not contain characters')
+    _RE_NAME_NUMBER = re.compile('must not start with a number')
+    _RE_UNKNOWN_SUBSTITUTION = re.compile('unknown substitution')
+    _RE_QOS_DEPTH = re.compile('must be greater than or equal to zero')
+    _RE_QOS_TYPE = re.compile('Expected QoSProfile or int')
+
     @classmethod
     def setUpClass(cls):
-        cls.context = rclpy.context.Context()
-        rclpy.init(context=cls.context)
+        cls.context = _get_context()
         cls.node = rclpy.create_node(
             TEST_NODE, namespace=TEST_NAMESPACE, context=cls.context,
             allow_undeclared_parameters=True)
+        # Only the executor property is exercised on this node, so it is shared by those tests.
+        cls.executor_node = rclpy.create_node('my_node', context=cls.context)
+        cls.executor = SingleThreadedExecutor(context=cls.context)
 
     @classmethod
     def tearDownClass(cls):
+        cls.executor.shutdown()
+        cls.executor_node.destroy_node()
         cls.node.destroy_node()
-        rclpy.shutdown(context=cls.context)
+
+    def tearDown(self):
+        self.executor_node.executor = None
 
     def test_accessors(self):
         self.assertIsNotNone(self.node.handle)
@@ -69,40 +129,49 @@ class TestNodeAllowUndeclaredParameters(unittest.TestCase):
         self.node.create_publisher(BasicTypes, 'chatter', 0)
         self.node.create_publisher(BasicTypes, 'chatter', 1)
         self.node.create_publisher(BasicTypes, 'chatter', qos_profile_sensor_data)
-        with self.assertRaisesRegex(InvalidTopicNameException, 'must not contain characters'):
+
+    def test_create_publisher_invalid_arguments(self):
+        # rcl rejects this topic itself; the Python-side validation then explains why.
+        with self.assertRaisesRegex(InvalidTopicNameException, self._RE_NAME_CHARS):
             self.node.create_publisher(BasicTypes, 'chatter?', 1)
-        with self.assertRaisesRegex(InvalidTopicNameException, 'must not start with a number'):
-            self.node.create_publisher(BasicTypes, '/chatter/42_is_the_answer', 1)
-        with self.assertRaisesRegex(ValueError, 'unknown substitution'):
-            self.node.create_publisher(BasicTypes, 'chatter/{bad_sub}', 1)
-        with self.assertRaisesRegex(ValueError, 'must be greater than or equal to zero'):
-            self.node.create_publisher(BasicTypes, 'chatter', -1)
-        with self.assertRaisesRegex(TypeError, 'Expected QoSProfile or int'):
-            self.node.create_publisher(BasicTypes, 'chatter', 'foo')
+        # Emulate rcl rejecting the other cases so only the Python-side validation runs.
+        with patch.object(_rclpy, 'rclpy_create_publisher', side_effect=ValueError):
+            with self.assertRaisesRegex(InvalidTopicNameException, self._RE_NAME_NUMBER):
+                self.node.create_publisher(BasicTypes, '/chatter/42_is_the_answer', 1)
+            with self.assertRaisesRegex(ValueError, self._RE_UNKNOWN_SUBSTITUTION):
+                self.node.create_publisher(BasicTypes, 'chatter/{bad_sub}', 1)
+            with self.assertRaisesRegex(ValueError, self._RE_QOS_DEPTH):
+                self.node.create_publisher(BasicTypes, 'chatter', -1)
+            with self.assertRaisesRegex(TypeError, self._RE_QOS_TYPE):
+                self.node.create_publisher(BasicTypes, 'chatter', 'foo')
 
     def test_create_subscription(self):
-        self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg), 0)
-        self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg), 1)
+        self.node.create_subscription(BasicTypes, 'chatter', ignore_message, 0)
+        self.node.create_subscription(BasicTypes, 'chatter', ignore_message, 1)
         self.node.create_subscription(
-            BasicTypes, 'chatter', lambda msg: print(msg), qos_profile_sensor_data)
-        with self.assertRaisesRegex(InvalidTopicNameException, 'must not contain characters'):
-            self.node.create_subscription(BasicTypes, 'chatter?', lambda msg: print(msg), 1)
-        with self.assertRaisesRegex(InvalidTopicNameException, 'must not start with a number'):
-            self.node.create_subscription(BasicTypes, '/chatter/42ish', lambda msg: print(msg), 1)
-        with self.assertRaisesRegex(ValueError, 'unknown substitution'):
-            self.node.create_subscription(BasicTypes, 'foo/{bad_sub}', lambda msg: print(msg), 1)
-        with self.assertRaisesRegex(ValueError, 'must be greater than or equal to zero'):
-            self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg), -1)
-        with self.assertRaisesRegex(TypeError, 'Expected QoSProfile or int'):
-            self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg), 'foo')
+            BasicTypes, 'chatter', ignore_message, qos_profile_sensor_data)
+
+    def test_create_subscription_invalid_arguments(self):
+        # rcl rejects this topic itself; the Python-side validation then explains why.
+        with self.assertRaisesRegex(InvalidTopicNameException, self._RE_NAME_CHARS):
+            self.node.create_subscription(BasicTypes, 'chatter?', ignore_message, 1)
+        # Emulate rcl rejecting the other cases so only the Python-side validation runs.
+        with patch.object(_rclpy, 'rclpy_create_subscription', side_effect=ValueError):
+            with self.assertRaisesRegex(InvalidTopicNameException, self._RE_NAME_NUMBER):
+                self.node.create_subscription(BasicTypes, '/chatter/42ish', ignore_message, 1)
+            with self.assertRaisesRegex(ValueError, self._RE_UNKNOWN_SUBSTITUTION):
+                self.node.create_subscription(BasicTypes, 'foo/{bad_sub}', ignore_message, 1)
+            with self.assertRaisesRegex(ValueError, self._RE_QOS_DEPTH):
+                self.node.create_subscription(BasicTypes, 'chatter', ignore_message, -1)
+            with self.assertRaisesRegex(TypeError, self._RE_QOS_TYPE):
+                self.node.create_subscription(BasicTypes, 'chatter', ignore_message, 'foo')
 
     def raw_subscription_callback(self, msg):
-        print('Raw subscription callback: %s length %d' % (msg, len(msg)))
         self.raw_subscription_msg = msg
 
     def test_create_raw_subscription(self):
-        executor = SingleThreadedExecutor(context=self.context)
-        executor.add_node(self.node)
+        self.node.executor = self.executor
+        self.addCleanup(setattr, self.node, 'executor', None)
         basic_types_pub = self.node.create_publisher(BasicTypes, 'raw_subscription_test', 1)
         self.raw_subscription_msg = None  # None=No result yet
         self.node.create_subscription(
@@ -113,64 +182,103 @@ class TestNodeAllowUndeclaredParameters(unittest.TestCase):
             raw=True
         )
         basic_types_msg = BasicTypes()
-        cycle_count = 0
-        while cycle_count < 5 and self.raw_subscription_msg is None:
-            basic_types_pub.publish(basic_types_msg)
-            cycle_count += 1
-            executor.spin_once(timeout_sec=1)
+        deadline = time.monotonic() + 2.0
+        # Wait for discovery before the first publish, rather than relying on the retries below.
+        while (
+            self.node.count_subscribers('raw_subscription_test') < 1 and
+            time.monotonic() < deadline
+        ):
+            self.executor.spin_once(timeout_sec=0.05)
+        spin_count = 0
+        while self.raw_subscription_msg is None and time.monotonic() < deadline:
+            # Publish again now and then, in case an earlier message went out before the
+            # publisher and the subscription were matched.
+            if spin_count % 10 == 0:
+                basic_types_pub.publish(basic_types_msg)
+            spin_count += 1
+            self.executor.spin_once(timeout_sec=0.05)
         self.assertIsNotNone(self.raw_subscription_msg, 'raw subscribe timed out')
         self.assertIs(type(self.raw_subscription_msg), bytes, 'raw subscribe did not return bytes')
         # The length might be implementation dependant, but shouldn't be zero
         # There may be a canonical serialization in the future at which point this can be updated
         self.assertNotEqual(len(self.raw_subscription_msg), 0, 'raw subscribe invalid length')
 
-        executor.shutdown()
+    def test_create_raw_subscription_take(self):
+        self.raw_subscription_msg = None  # None=No result yet
+        sub = self.node.create_subscription(
+            BasicTypes,
+            'raw_subscription_take_test',
+            self.raw_subscription_callback,
+            1,
+            raw=True
+        )
+        # Check that the executor asks rclpy_take for a raw message and hands the buffer it gets
+        # back to the callback unchanged.
+        serialized_msg = b'\x00' * 16
+        with patch.object(_rclpy, 'rclpy_take', return_value=serialized_msg) as rclpy_take:
+            msg = self.executor._take_subscription(sub)
+        rclpy_take.assert_called_once()
+        self.assertEqual(rclpy_take.call_args[0][1:], (BasicTypes, True))
+        with self.assertRaises(StopIteration):
+            self.executor._execute_subscription(sub, msg).send(None)
+        self.assertIs(self.raw_subscription_msg, serialized_msg)
 
     def test_create_client(self):
         self.node.create_client(GetParameters, 'get/parameters')
-        with self.assertRaisesRegex(InvalidServiceNameException, 'must not contain characters'):
+
+    def test_create_client_invalid_arguments(self):
+        # rcl rejects this service name itself; the Python-side validation then explains why.
+        with self.assertRaisesRegex(InvalidServiceNameException, self._RE_NAME_CHARS):
             self.node.create_client(GetParameters, 'get/parameters?')
-        with self.assertRaisesRegex(InvalidServiceNameException, 'must not start with a number'):
-            self.node.create_client(GetParameters, '/get/42parameters')
-        with self.assertRaisesRegex(ValueError, 'unknown substitution'):
-            self.node.create_client(GetParameters, 'foo/{bad_sub}')
+        # Emulate rcl rejecting the other cases so only the Python-side validation runs.
+        with patch.object(_rclpy, 'rclpy_create_client', side_effect=ValueError):
+            with self.assertRaisesRegex(InvalidServiceNameException, self._RE_NAME_NUMBER):
+                self.node.create_client(GetParameters, '/get/42parameters')
+            with self.assertRaisesRegex(ValueError, self._RE_UNKNOWN_SUBSTITUTION):
+                self.node.create_client(GetParameters, 'foo/{bad_sub}')
 
     def test_create_service(self):
         self.node.create_service(GetParameters, 'get/parameters', lambda req: None)
-        with self.assertRaisesRegex(InvalidServiceNameException, 'must not contain characters'):
+
+    def test_create_service_invalid_arguments(self):
+        # rcl rejects this service name itself; the Python-side validation then explains why.
+        with self.assertRaisesRegex(InvalidServiceNameException, self._RE_NAME_CHARS):
             self.node.create_service(GetParameters, 'get/parameters?', lambda req: None)
-        with self.assertRaisesRegex(InvalidServiceNameException, 'must not start with a number'):
-            self.node.create_service(GetParameters, '/get/42parameters', lambda req: None)
-        with self.assertRaisesRegex(ValueError, 'unknown substitution'):
-            self.node.create_service(GetParameters, 'foo/{bad_sub}', lambda req: None)
+        # Emulate rcl rejecting the other cases so only the Python-side validation runs.
+        with patch.object(_rclpy, 'rclpy_create_service', side_effect=ValueError):
+            with self.assertRaisesRegex(InvalidServiceNameException, self._RE_NAME_NUMBER):
+                self.node.create_service(GetParameters, '/get/42parameters', lambda req: None)
+            with self.assertRaisesRegex(ValueError, self._RE_UNKNOWN_SUBSTITUTION):
+                self.node.create_service(GetParameters, 'foo/{bad_sub}', lambda req: None)
 
     def test_deprecation_warnings(self):
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            self.node.create_publisher(BasicTypes, 'chatter')
-            assert len(w) == 1
-            assert issubclass(w[0].category, UserWarning)
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            self.node.create_publisher(BasicTypes, 'chatter', qos_profile_default)
-            assert len(w) == 1
-            assert issubclass(w[0].category, UserWarning)
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg))
-            assert len(w) == 1
-            assert issubclass(w[0].category, UserWarning)
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            self.node.create_subscription(
-                BasicTypes, 'chatter', lambda msg: print(msg), qos_profile_default)
-            assert len(w) == 1
-            assert issubclass(w[0].category, UserWarning)
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            self.node.create_subscription(BasicTypes, 'chatter', lambda msg: print(msg), raw=True)
-            assert len(w) == 1
-            assert issubclass(w[0].category, UserWarning)
+        # The warnings are emitted before the type support is checked, so stop creation there to
+        # avoid creating rmw entities that are not needed by this test.
+        deprecated_calls = [
+            (self.node.create_publisher, (BasicTypes, 'chatter'), {}),
+            (self.node.create_publisher, (BasicTypes, 'chatter', qos_profile_default), {}),
+            (self.node.create_subscription, (BasicTypes, 'chatter', ignore_message), {}),
+            (
+                self.node.create_subscription,
+                (BasicTypes, 'chatter', ignore_message, qos_profile_default),
+                {}
+            ),
+            (
+                self.node.create_subscription,
+                (BasicTypes, 'chatter', ignore_message),
+                {'raw': True}
+            ),
+        ]
+        for create, args, kwargs in deprecated_calls:
+            with self.subTest(create=create.__name__, args=args, kwargs=kwargs):
+                with warnings.catch_warnings(record=True) as w, patch(
+                    'rclpy.node.check_for_type_support', side_effect=_StopEntityCreation
+                ):
+                    warnings.simplefilter('always')
+                    with self.assertRaises(_StopEntityCreation):
+                        create(*args, **kwargs)
+                    assert len(w) == 1
+                    assert issubclass(w[0].category, UserWarning)
 
     def test_service_names_and_types(self):
         # test that it doesn't raise
@@ -208,15 +316,15 @@ class TestNodeAllowUndeclaredParameters(unittest.TestCase):
         self.assertEqual(1, self.node.count_publishers(short_topic_name))
         self.assertEqual(1, self.node.count_publishers(fq_topic_name))
 
-        self.node.create_subscription(BasicTypes, short_topic_name, lambda msg: print(msg), 1)
+        self.node.create_subscription(BasicTypes, short_topic_name, ignore_message, 1)
         self.assertEqual(1, self.node.count_subscribers(short_topic_name))
         self.assertEqual(1, self.node.count_subscribers(fq_topic_name))
 
-        self.node.create_subscription(BasicTypes, short_topic_name, lambda msg: print(msg), 1)
+        self.node.create_subscription(BasicTypes, short_topic_name, ignore_message, 1)
         self.assertEqual(2, self.node.count_subscribers(short_topic_name))
         self.assertEqual(2, self.node.count_subscribers(fq_topic_name))
 
-        # error cases
+    def test_count_publishers_subscribers_invalid_arguments(self):
         with self.assertRaisesRegex(TypeError, 'bad argument type for built-in operation'):
             self.node.count_subscribers(1)
         with self.assertRaisesRegex(ValueError, 'is invalid'):
@@ -232,139 +340,114 @@ class TestNodeAllowUndeclaredParameters(unittest.TestCase):
         node_logger.debug('test')
 
     def test_initially_no_executor(self):
-        node = rclpy.create_node('my_node', context=self.context)
-        try:
-            assert node.executor is None
-        finally:
-            node.destroy_node()
+        assert self.executor_node.executor is None
 
     def test_set_executor_adds_node_to_it(self):
-        node = rclpy.create_node('my_node', context=self.context)
         executor = Mock()
         executor.add_node.return_value = True
-        try:
-            node.executor = executor
-            assert id(executor) == id(node.executor)
-        finally:
-            node.destroy_node()
-        executor.add_node.assert_called_once_with(node)
+        self.executor_node.executor = executor
+        assert id(executor) == id(self.executor_node.executor)
+        executor.add_node.assert_called_once_with(self.executor_node)
 
     def test_set_executor_removes_node_from_old_executor(self):
-        node = rclpy.create_node('my_node', context=self.context)
         old_executor = Mock()
         old_executor.add_node.return_value = True
         new_executor = Mock()
         new_executor.add_node.return_value = True
-        try:
-            node.executor = old_executor
-            assert id(old_executor) == id(node.executor)
-            node.executor = new_executor
-            assert id(new_executor) == id(node.executor)
-        finally:
-            node.destroy_node()
-        old_executor.remove_node.assert_called_once_with(node)
+        self.executor_node.executor = old_executor
+        assert id(old_executor) == id(self.executor_node.executor)
+        self.executor_node.executor = new_executor
+        assert id(new_executor) == id(self.executor_node.executor)
+        old_executor.remove_node.assert_called_once_with(self.executor_node)
         new_executor.remove_node.assert_not_called()
 
     def test_set_executor_clear_executor(self):
-        node = rclpy.create_node('my_node', context=self.context)
         executor = Mock()
         executor.add_node.return_value = True
-        try:
-            node.executor = executor
-            assert id(executor) == id(node.executor)
-            node.executor = None
-            assert node.executor is None
-        finally:
-            node.destroy_node()
+        self.executor_node.executor = executor
+        assert id(executor) == id(self.executor_node.executor)
+        self.executor_node.executor = None
+        assert self.executor_node.executor is None
 
     def test_node_set_parameters(self):
-        results = self.node.set_parameters([
-            Parameter('foo', Parameter.Type.INTEGER, 42),
-            Parameter('bar', Parameter.Type.STRING, 'hello'),
-            Parameter('baz', Parameter.Type.DOUBLE, 2.41)
-        ])
+        results = self.node.set_parameters([FOO_PARAMETER, BAR_PARAMETER, BAZ_PARAMETER])
         self.assertTrue(all(isinstance(result, SetParametersResult) for result in results))
         self.assertTrue(all(result.successful for result in results))
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
     def test_node_cannot_set_invalid_parameters(self):
         with self.assertRaises(TypeError):
             self.node.set_parameters([42])
 
     def test_node_set_parameters_atomically(self):
-        result = self.node.set_parameters_atomically([
-            Parameter('foo', Parameter.Type.INTEGER, 42),
-            Parameter('bar', Parameter.Type.STRING, 'hello'),
-            Parameter('baz', Parameter.Type.DOUBLE, 2.41)
-        ])
+        result = self.node.set_parameters_atomically([FOO_PARAMETER, BAR_PARAMETER, BAZ_PARAMETER])
         self.assertEqual(self.node.get_parameter('foo').value, 42)
         self.assertIsInstance(result, SetParametersResult)
         self.assertTrue(result.successful)
 
-    def test_describe_undeclared_parameter(self):
-        self.assertFalse(self.node.has_parameter('foo'))
-
-        descriptor = self.node.describe_parameter('foo')
-        self.assertEqual(descriptor, ParameterDescriptor())
-
     def test_describe_undeclared_parameters(self):
         self.assertFalse(self.node.has_parameter('foo'))
         self.assertFalse(self.node.has_parameter('bar'))
 
+        # Check single parameter.
+        descriptor = self.node.describe_parameter('foo')
+        self.assertEqual(descriptor, EMPTY_DESCRIPTOR)
+
         # Check list.
         descriptor_list = self.node.describe_parameters(['foo', 'bar'])
         self.assertIsInstance(descriptor_list, list)
         self.assertEqual(len(descriptor_list), 2)
-        self.assertEqual(descriptor_list[0], ParameterDescriptor())
-        self.assertEqual(descriptor_list[1], ParameterDescriptor())
+        self.assertEqual(descriptor_list[0], EMPTY_DESCRIPTOR)
+        self.assertEqual(descriptor_list[1], EMPTY_DESCRIPTOR)
 
     def test_node_get_parameter(self):
-        self.node.set_parameters([Parameter('foo', Parameter.Type.INTEGER, 42)])
-        self.assertIsInstance(self.node.get_parameter('foo'), Parameter)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
+        self.node.set_parameters([FOO_PARAMETER])
+        parameter = self.node.get_parameter('foo')
+        self.assertIsInstance(parameter, Parameter)
+        self.assertEqual(parameter.value, 42)
 
     def test_node_get_parameter_returns_parameter_not_set(self):
-        self.assertIsInstance(self.node.get_parameter('unset'), Parameter)
-        self.assertEqual(self.node.get_parameter('unset').type_, Parameter.Type.NOT_SET)
+        parameter = self.node.get_parameter('unset')
+        self.assertIsInstance(parameter, Parameter)
+        self.assertEqual(parameter.type_, Parameter.Type.NOT_SET)
 
     def test_node_has_parameter_services(self):
-        service_names_and_types = self.node.get_service_names_and_types()
-        self.assertIn(
-            ('/my_ns/my_node/describe_parameters', ['rcl_interfaces/srv/DescribeParameters']),
-            service_names_and_types
-        )
-        self.assertIn(
-            ('/my_ns/my_node/get_parameter_types', ['rcl_interfaces/srv/GetParameterTypes']),
-            service_names_and_types
-        )
-        self.assertIn(
-            ('/my_ns/my_node/get_parameters', ['rcl_interfaces/srv/GetParameters']),
-            service_names_and_types
-        )
-        self.assertIn(
-            ('/my_ns/my_node/list_parameters', ['rcl_interfaces/srv/ListParameters']),
-            service_names_and_types
-        )
-        self.assertIn(
-            ('/my_ns/my_node/set_parameters', ['rcl_interfaces/srv/SetParameters']),
-            service_names_and_types
-        )
-        self.assertIn(
-            (
-                '/my_ns/my_node/set_parameters_atomically',
-                ['rcl_interfaces/srv/SetParametersAtomically']
-            ), service_names_and_types
-        )
+        prefix = '%s/%s/' % (TEST_NAMESPACE, TEST_NODE)
+        node_services = {
+            name[len(prefix):]: frozenset(types)
+            for name, types in self.node.get_service_names_and_types()
+            if name.startswith(prefix)
+        }
+        expected_services = {
+            'describe_parameters': frozenset({'rcl_interfaces/srv/DescribeParameters'}),
+            'get_parameter_types': frozenset({'rcl_interfaces/srv/GetParameterTypes'}),
+            'get_parameters': frozenset({'rcl_interfaces/srv/GetParameters'}),
+            'list_parameters': frozenset({'rcl_interfaces/srv/ListParameters'}),
+            'set_parameters': frozenset({'rcl_interfaces/srv/SetParameters'}),
+            'set_parameters_atomically': frozenset({'rcl_interfaces/srv/SetParametersAtomically'}),
+        }
+        # All six parameter services must be advertised with their types in one comparison.
+        self.assertLessEqual(expected_services.items(), node_services.items())
 
 
 class TestNode(unittest.TestCase):
 
+    # The node never modifies the ranges in a descriptor, so they can be shared between tests.
+    # Descriptors themselves can't, as the node stores them and overwrites their name and type.
+    _FP_RANGE = FloatingPointRange(from_value=0.0, to_value=10.0, step=0.5)
+    _FP_RANGE_LARGE_STEP = FloatingPointRange(from_value=-10.0, to_value=0.0, step=30.0)
+    _FP_RANGE_NO_STEP = FloatingPointRange(from_value=-10.0, to_value=10.0, step=0.0)
+    _INTEGER_RANGE = IntegerRange(from_value=0, to_value=10, step=2)
+    _INTEGER_RANGE_LARGE_STEP = IntegerRange(from_value=-10, to_value=0, step=30)
+    _INTEGER_RANGE_NO_STEP = IntegerRange(from_value=-10, to_value=10, step=0)
+
     @classmethod
+    def setUpClass(cls):
+        cls.context = _get_context()
+
     def setUp(self):
-        self.context = rclpy.context.Context()
-        rclpy.init(context=self.context)
         self.node = rclpy.create_node(
             TEST_NODE,
             namespace=TEST_NAMESPACE,
@@ -377,14 +460,12 @@ class TestNode(unittest.TestCase):
             automatically_declare_parameters_from_overrides=False
         )
 
-    @classmethod
     def tearDown(self):
         self.node.destroy_node()
-        rclpy.shutdown(context=self.context)
 
     def test_declare_parameter(self):
         result_initial_foo = self.node.declare_parameter(
-            'initial_foo', ParameterValue(), ParameterDescriptor())
+            'initial_foo', EMPTY_PARAMETER_VALUE, ParameterDescriptor())
         result_foo = self.node.declare_parameter(
             'foo', 42, ParameterDescriptor())
         result_bar = self.node.declare_parameter(
@@ -404,11 +485,9 @@ class TestNode(unittest.TestCase):
         self.assertEqual(result_bar.value, 'hello')
         self.assertEqual(result_baz.value, 2.41)
         self.assertIsNone(result_value_not_set.value)
-        self.assertEqual(self.node.get_parameter('initial_foo').value, 4321)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
-        self.assertIsNone(self.node.get_parameter('value_not_set').value)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['initial_foo', 'foo', 'bar', 'baz', 'value_not_set']),
+            {'initial_foo': 4321, 'foo': 42, 'bar': 'hello', 'baz': 2.41, 'value_not_set': None})
         self.assertTrue(self.node.has_parameter('value_not_set'))
 
         # Error cases.
@@ -437,11 +516,23 @@ class TestNode(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             self.node.declare_parameter(
-                'wrong_parameter_value_type', ParameterValue(), ParameterDescriptor())
+                'wrong_parameter_value_type', EMPTY_PARAMETER_VALUE, ParameterDescriptor())
 
         with self.assertRaises(TypeError):
             self.node.declare_parameter(
-                'wrong_parameter_descriptor_type', 1, ParameterValue())
+                'wrong_parameter_descriptor_type', 1, EMPTY_PARAMETER_VALUE)
+
+    def test_declare_parameter_default_descriptor(self):
+        self.node.declare_parameter('foo', 42)
+        self.node.declare_parameter('bar', 'hello')
+
+        # Each parameter gets its own descriptor when none is given.
+        self.assertEqual(self.node.describe_parameter('foo').name, 'foo')
+        self.assertEqual(
+            self.node.describe_parameter('foo').type, ParameterType.PARAMETER_INTEGER)
+        self.assertEqual(self.node.describe_parameter('bar').name, 'bar')
+        self.assertEqual(
+            self.node.describe_parameter('bar').type, ParameterType.PARAMETER_STRING)
 
     def test_declare_parameters(self):
         parameters = [
@@ -463,9 +554,9 @@ class TestNode(unittest.TestCase):
         self.assertEqual(result[1].value, 'hello')
         self.assertEqual(result[2].value, 2.41)
         self.assertIsNone(result[3].value)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
         self.assertIsNone(self.node.get_parameter('value_not_set').value)
         self.assertTrue(self.node.has_parameter('value_not_set'))
 
@@ -481,9 +572,9 @@ class TestNode(unittest.TestCase):
         self.assertEqual(result[1].value, 'hello')
         self.assertEqual(result[2].value, 2.41)
         self.assertIsNone(result[3].value)
-        self.assertEqual(self.node.get_parameter('namespace.foo').value, 42)
-        self.assertEqual(self.node.get_parameter('namespace.bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('namespace.baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['namespace.foo', 'namespace.bar', 'namespace.baz']),
+            {'namespace.foo': 42, 'namespace.bar': 'hello', 'namespace.baz': 2.41})
         self.assertIsNone(self.node.get_parameter('namespace.value_not_set').value)
         self.assertTrue(self.node.has_parameter('namespace.value_not_set'))
 
@@ -535,7 +626,7 @@ class TestNode(unittest.TestCase):
                 '',
                 [(
                     'wrong_parameter_value_type',
-                    ParameterValue(),
+                    EMPTY_PARAMETER_VALUE,
                     ParameterDescriptor()
                 )]
             )
@@ -545,23 +636,28 @@ class TestNode(unittest.TestCase):
                 '',
                 [(
                     'wrong_parameter_descriptor_tpye',
-                    ParameterValue(),
-                    ParameterValue()
+                    EMPTY_PARAMETER_VALUE,
+                    EMPTY_PARAMETER_VALUE
                 )]
             )
 
     def reject_parameter_callback(self, parameter_list):
-        rejected_parameters = (param for param in parameter_list if 'reject' in param.name)
-        return SetParametersResult(successful=(not any(rejected_parameters)))
+        return SetParametersResult(
+            successful=not any('reject' in param.name for param in parameter_list))
+
+    def test_declare_parameters_str_subclass_name(self):
+        class ParameterName(str):
+            pass
+
+        result = self.node.declare_parameters('', [(ParameterName('subclass_name'), 42)])
+        self.assertEqual(result[0].value, 42)
+        self.assertEqual(self.node.get_parameter('subclass_name').value, 42)
 
     def test_node_undeclare_parameter_has_parameter(self):
         # Undeclare unexisting parameter.
         with self.assertRaises(ParameterNotDeclaredException):
             self.node.undeclare_parameter('foo')
 
-        # Verify that it doesn't exist.
-        self.assertFalse(self.node.has_parameter('foo'))
-
         # Declare parameter, verify existance, undeclare, and verify again.
         self.node.declare_parameter(
             'foo',
@@ -573,7 +669,6 @@ class TestNode(unittest.TestCase):
         self.assertFalse(self.node.has_parameter('foo'))
 
         # Try with a read only parameter.
-        self.assertFalse(self.node.has_parameter('immutable_foo'))
         self.node.declare_parameter(
             'immutable_foo',
             'I am immutable',
@@ -588,19 +683,13 @@ class TestNode(unittest.TestCase):
 
     def test_node_set_undeclared_parameters(self):
         with self.assertRaises(ParameterNotDeclaredException):
-            self.node.set_parameters([
-                Parameter('foo', Parameter.Type.INTEGER, 42),
-                Parameter('bar', Parameter.Type.STRING, 'hello'),
-                Parameter('baz', Parameter.Type.DOUBLE, 2.41)
-            ])
+            self.node.set_parameters([FOO_PARAMETER, BAR_PARAMETER, BAZ_PARAMETER])
 
     def test_node_set_undeclared_parameters_atomically(self):
-        with self.assertRaises(ParameterNotDeclaredException):
-            self.node.set_parameters_atomically([
-                Parameter('foo', Parameter.Type.INTEGER, 42),
-                Parameter('bar', Parameter.Type.STRING, 'hello'),
-                Parameter('baz', Parameter.Type.DOUBLE, 2.41)
-            ])
+        with self.assertRaises(ParameterNotDeclaredException) as cm:
+            self.node.set_parameters_atomically([FOO_PARAMETER, BAR_PARAMETER, BAZ_PARAMETER])
+        # All the undeclared parameters are reported.
+        self.assertEqual(cm.exception.args[1], ['foo', 'bar', 'baz'])
 
     def test_node_get_undeclared_parameter(self):
         with self.assertRaises(ParameterNotDeclaredException):
@@ -635,20 +724,7 @@ class TestNode(unittest.TestCase):
         ]
 
         # Create rclpy.Parameter list from tuples.
-        parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-        ]
+        parameters = [Parameter(name=name, value=value) for name, value, _ in parameter_tuples]
 
         with self.assertRaises(ParameterNotDeclaredException):
             self.node.set_parameters(parameters)
@@ -664,9 +740,9 @@ class TestNode(unittest.TestCase):
         self.assertTrue(result[0].successful)
         self.assertTrue(result[1].successful)
         self.assertTrue(result[2].successful)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
         # Now we modify the declared parameters, add a new one and set them again.
         integer_value = 24
@@ -680,31 +756,18 @@ class TestNode(unittest.TestCase):
                 ParameterDescriptor())
             )
         parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-            Parameter(
-                name=parameter_tuples[3][0],
-                value=float_value
-            ),
+            Parameter(name=name, value=value)
+            for (name, _, _), value in zip(
+                parameter_tuples, [integer_value, string_value, float_value, float_value])
         ]
         # The first three parameters should have been set; the fourth one causes the exception.
         with self.assertRaises(ParameterNotDeclaredException):
             self.node.set_parameters(parameters)
 
         # Validate first three.
-        self.assertEqual(self.node.get_parameter('foo').value, 24)
-        self.assertEqual(self.node.get_parameter('bar').value, 'bye')
-        self.assertEqual(self.node.get_parameter('baz').value, 1.42)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 24, 'bar': 'bye', 'baz': 1.42})
 
         # Confirm that the fourth one does not exist.
         with self.assertRaises(ParameterNotDeclaredException):
@@ -754,44 +817,12 @@ class TestNode(unittest.TestCase):
             )
         ]
 
-        # Create rclpy.Parameter list from tuples.
-        parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-        ]
-
         self.node.declare_parameters('', parameter_tuples)
 
         # Try setting a different value to the declared parameters.
-        integer_value = 24
-        string_value = 'bye'
-
-        float_value = 1.42
-
-        # Re-create parameters with modified values.
         parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
+            Parameter(name=name, value=value)
+            for (name, _, _), value in zip(parameter_tuples, [24, 'bye', 1.42])
         ]
 
         result = self.node.set_parameters(parameters)
@@ -804,9 +835,9 @@ class TestNode(unittest.TestCase):
         self.assertFalse(result[0].successful)
         self.assertTrue(result[1].successful)
         self.assertFalse(result[2].successful)
-        self.assertEqual(self.node.get_parameter('immutable_foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'bye')
-        self.assertEqual(self.node.get_parameter('immutable_baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['immutable_foo', 'bar', 'immutable_baz']),
+            {'immutable_foo': 42, 'bar': 'bye', 'immutable_baz': 2.41})
 
     def test_node_set_parameters_implicit_undeclare(self):
         parameter_tuples = [
@@ -830,9 +861,9 @@ class TestNode(unittest.TestCase):
         self.node.declare_parameters('', parameter_tuples)
 
         # Verify that the parameters are set.
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
         # Now undeclare one of them implicitly.
         self.node.set_parameters([Parameter('bar', Parameter.Type.NOT_SET, None)])
@@ -863,20 +894,7 @@ class TestNode(unittest.TestCase):
         ]
 
         # Create rclpy.Parameter list from tuples.
-        parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-        ]
+        parameters = [Parameter(name=name, value=value) for name, value, _ in parameter_tuples]
 
         with self.assertRaises(ParameterNotDeclaredException):
             self.node.set_parameters_atomically(parameters)
@@ -887,9 +905,9 @@ class TestNode(unittest.TestCase):
         # OK case: check successful aggregated result.
         self.assertIsInstance(result, SetParametersResult)
         self.assertTrue(result.successful)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
         # Now we modify the declared parameters, add a new one and set them again.
         integer_value = 24
@@ -903,22 +921,9 @@ class TestNode(unittest.TestCase):
                 ParameterDescriptor())
             )
         parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-            Parameter(
-                name=parameter_tuples[3][0],
-                value=float_value
-            ),
+            Parameter(name=name, value=value)
+            for (name, _, _), value in zip(
+                parameter_tuples, [integer_value, string_value, float_value, float_value])
         ]
 
         # The fourth parameter causes the exception, hence none is set.
@@ -926,9 +931,9 @@ class TestNode(unittest.TestCase):
             self.node.set_parameters_atomically(parameters)
 
         # Confirm that the first three were not modified.
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
         # Confirm that the fourth one does not exist.
         with self.assertRaises(ParameterNotDeclaredException):
@@ -977,42 +982,12 @@ class TestNode(unittest.TestCase):
             )
         ]
 
-        # Create rclpy.Parameter list from tuples.
-        parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
-        ]
-
         self.node.declare_parameters('', parameter_tuples)
 
         # Try setting a different value to the declared parameters.
-        integer_value = 24
-        string_value = 'bye'
-        float_value = 1.42
-
         parameters = [
-            Parameter(
-                name=parameter_tuples[0][0],
-                value=integer_value
-            ),
-            Parameter(
-                name=parameter_tuples[1][0],
-                value=string_value
-            ),
-            Parameter(
-                name=parameter_tuples[2][0],
-                value=float_value
-            ),
+            Parameter(name=name, value=value)
+            for (name, _, _), value in zip(parameter_tuples, [24, 'bye', 1.42])
         ]
 
         result = self.node.set_parameters_atomically(parameters)
@@ -1021,9 +996,9 @@ class TestNode(unittest.TestCase):
         # All the parameters should have their original value.
         self.assertIsInstance(result, SetParametersResult)
         self.assertFalse(result.successful)
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('immutable_baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'immutable_baz']),
+            {'foo': 42, 'bar': 'hello', 'immutable_baz': 2.41})
 
     def test_node_set_parameters_atomically_implicit_undeclare(self):
         parameter_tuples = [
@@ -1047,9 +1022,9 @@ class TestNode(unittest.TestCase):
         self.node.declare_parameters('', parameter_tuples)
 
         # Verify that the parameters are set.
-        self.assertEqual(self.node.get_parameter('foo').value, 42)
-        self.assertEqual(self.node.get_parameter('bar').value, 'hello')
-        self.assertEqual(self.node.get_parameter('baz').value, 2.41)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['foo', 'bar', 'baz']),
+            {'foo': 42, 'bar': 'hello', 'baz': 2.41})
 
         # Now undeclare one of them implicitly.
         self.node.set_parameters_atomically([Parameter('bar', Parameter.Type.NOT_SET, None)])
@@ -1242,7 +1217,7 @@ class TestNode(unittest.TestCase):
 
     def test_floating_point_range_descriptor(self):
         # OK cases; non-floats are not affected by the range.
-        fp_range = FloatingPointRange(from_value=0.0, to_value=10.0, step=0.5)
+        fp_range = self._FP_RANGE
         parameters = [
             ('from_value', 0.0, ParameterDescriptor(floating_point_range=[fp_range])),
             ('to_value', 10.0, ParameterDescriptor(floating_point_range=[fp_range])),
@@ -1264,10 +1239,9 @@ class TestNode(unittest.TestCase):
         self.assertAlmostEqual(result[2].value, 4.5)
         self.assertEqual(result[3].value, 'I am no float')
         self.assertEqual(result[4].value, 123)
-        self.assertEqual(self.node.get_parameter('from_value').value, 0.0)
-        self.assertEqual(self.node.get_parameter('to_value').value, 10.0)
-        self.assertEqual(self.node.get_parameter('in_range').value, 4.5)
-        self.assertEqual(self.node.get_parameter('str_value').value, 'I am no float')
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['from_value', 'to_value', 'in_range', 'str_value']),
+            {'from_value': 0.0, 'to_value': 10.0, 'in_range': 4.5, 'str_value': 'I am no float'})
         self.assertAlmostEqual(self.node.get_parameter('int_value').value, 123)
 
         # Try to set a parameter out of range.
@@ -1293,7 +1267,7 @@ class TestNode(unittest.TestCase):
 
         # From and to are always valid.
         # Parameters that don't comply with the description will raise an exception.
-        fp_range = FloatingPointRange(from_value=-10.0, to_value=0.0, step=30.0)
+        fp_range = self._FP_RANGE_LARGE_STEP
         parameters = [
             ('from_value_2', -10.0, ParameterDescriptor(floating_point_range=[fp_range])),
             ('to_value_2', 0.0, ParameterDescriptor(floating_point_range=[fp_range])),
@@ -1303,13 +1277,14 @@ class TestNode(unittest.TestCase):
         with self.assertRaises(InvalidParameterValueException):
             self.node.declare_parameters('', parameters)
 
-        self.assertAlmostEqual(self.node.get_parameter('from_value_2').value, -10.0)
-        self.assertAlmostEqual(self.node.get_parameter('to_value_2').value, 0.0)
+        values = get_parameter_values(self.node, ['from_value_2', 'to_value_2'])
+        self.assertAlmostEqual(values['from_value_2'], -10.0)
+        self.assertAlmostEqual(values['to_value_2'], 0.0)
         self.assertFalse(self.node.has_parameter('in_range_bad_step'))
         self.assertFalse(self.node.has_parameter('out_of_range'))
 
         # Try some more parameters with no step.
-        fp_range = FloatingPointRange(from_value=-10.0, to_value=10.0, step=0.0)
+        fp_range = self._FP_RANGE_NO_STEP
         parameters = [
             ('from_value_no_step', -10.0, ParameterDescriptor(floating_point_range=[fp_range])),
             ('to_value_no_step', 10.0, ParameterDescriptor(floating_point_range=[fp_range])),
@@ -1325,13 +1300,15 @@ class TestNode(unittest.TestCase):
         self.assertAlmostEqual(result[0].value, -10.0)
         self.assertAlmostEqual(result[1].value, 10.0)
         self.assertAlmostEqual(result[2].value, 5.37)
-        self.assertAlmostEqual(self.node.get_parameter('from_value_no_step').value, -10.0)
-        self.assertAlmostEqual(self.node.get_parameter('to_value_no_step').value, 10.0)
-        self.assertAlmostEqual(self.node.get_parameter('in_range_no_step').value, 5.37)
+        values = get_parameter_values(
+            self.node, ['from_value_no_step', 'to_value_no_step', 'in_range_no_step'])
+        self.assertAlmostEqual(values['from_value_no_step'], -10.0)
+        self.assertAlmostEqual(values['to_value_no_step'], 10.0)
+        self.assertAlmostEqual(values['in_range_no_step'], 5.37)
 
     def test_integer_range_descriptor(self):
         # OK cases; non-integers are not affected by the range.
-        integer_range = IntegerRange(from_value=0, to_value=10, step=2)
+        integer_range = self._INTEGER_RANGE
         parameters = [
             ('from_value', 0, ParameterDescriptor(integer_range=[integer_range])),
             ('to_value', 10, ParameterDescriptor(integer_range=[integer_range])),
@@ -1353,10 +1330,9 @@ class TestNode(unittest.TestCase):
         self.assertEqual(result[2].value, 4)
         self.assertEqual(result[3].value, 'I am no integer')
         self.assertAlmostEqual(result[4].value, 123.0)
-        self.assertEqual(self.node.get_parameter('from_value').value, 0)
-        self.assertEqual(self.node.get_parameter('to_value').value, 10)
-        self.assertEqual(self.node.get_parameter('in_range').value, 4)
-        self.assertEqual(self.node.get_parameter('str_value').value, 'I am no integer')
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['from_value', 'to_value', 'in_range', 'str_value']),
+            {'from_value': 0, 'to_value': 10, 'in_range': 4, 'str_value': 'I am no integer'})
         self.assertAlmostEqual(self.node.get_parameter('float_value').value, 123.0)
 
         # Try to set a parameter out of range.
@@ -1382,7 +1358,7 @@ class TestNode(unittest.TestCase):
 
         # From and to are always valid.
         # Parameters that don't comply with the description will raise an exception.
-        integer_range = IntegerRange(from_value=-10, to_value=0, step=30)
+        integer_range = self._INTEGER_RANGE_LARGE_STEP
         parameters = [
             ('from_value_2', -10, ParameterDescriptor(integer_range=[integer_range])),
             ('to_value_2', 0, ParameterDescriptor(integer_range=[integer_range])),
@@ -1392,13 +1368,14 @@ class TestNode(unittest.TestCase):
         with self.assertRaises(InvalidParameterValueException):
             self.node.declare_parameters('', parameters)
 
-        self.assertEqual(self.node.get_parameter('from_value_2').value, -10)
-        self.assertEqual(self.node.get_parameter('to_value_2').value, 0)
+        self.assertDictEqual(
+            get_parameter_values(self.node, ['from_value_2', 'to_value_2']),
+            {'from_value_2': -10, 'to_value_2': 0})
         self.assertFalse(self.node.has_parameter('in_range_bad_step'))
         self.assertFalse(self.node.has_parameter('out_of_range'))
 
         # Try some more parameters with no step.
-        integer_range = IntegerRange(from_value=-10, to_value=10, step=0)
+        integer_range = self._INTEGER_RANGE_NO_STEP
         parameters = [
             ('from_value_no_step', -10, ParameterDescriptor(integer_range=[integer_range])),
             ('to_value_no_step', 10, ParameterDescriptor(integer_range=[integer_range])),
@@ -1411,41 +1388,65 @@ class TestNode(unittest.TestCase):
         self.assertIsInstance(result[0], Parameter)
         self.assertIsInstance(result[1], Parameter)
         self.assertIsInstance(result[2], Parameter)
-        self.assertEqual(result[0].value, -10)
-        self.assertEqual(result[1].value, 10)
-        self.assertEqual(result[2].value, 5)
-        self.assertEqual(self.node.get_parameter('from_value_no_step').value, -10)
-        self.assertEqual(self.node.get_parameter('to_value_no_step').value, 10)
-        self.assertEqual(self.node.get_parameter('in_range_no_step').value, 5)
-
+        self.assertEqual(tuple(parameter.value for parameter in result), (-10, 10, 5))
+        self.assertDictEqual(
+            get_parameter_values(
+                self.node,
+                ['from_value_no_step', 'to_value_no_step', 'in_range_no_step']),
+            {'from_value_no_step': -10, 'to_value_no_step': 10, 'in_range_no_step': 5})
+
+    def test_integer_range_descriptor_same_value(self):
+        self.node.declare_parameter(
+            'in_range', 4, ParameterDescriptor(integer_range=[self._INTEGER_RANGE]))
 
-class TestCreateNode(unittest.TestCase):
+        with patch.object(
+            self.node, '_apply_integer_range', wraps=self.node._apply_integer_range
+        ) as apply_integer_range:
+            # The stored value already passed the range check of the stored descriptor.
+            result = self.node.set_parameters([Parameter('in_range', value=4)])
+            self.assertTrue(result[0].successful)
+            apply_integer_range.assert_not_called()
 
-    def test_use_global_arguments(self):
-        context = rclpy.context.Context()
-        rclpy.init(args=['process_name', '__node:=global_node_name'], context=context)
-        try:
-            node1 = rclpy.create_node(
-                'my_node', namespace='/my_ns', use_global_arguments=True, context=context)
-            node2 = rclpy.create_node(
-                'my_node', namespace='/my_ns', use_global_arguments=False, context=context)
-            self.assertEqual('global_node_name', node1.get_name())
-            self.assertEqual('my_node', node2.get_name())
-            node1.destroy_node()
-            node2.destroy_node()
-        finally:
-            rclpy.shutdown(context=context)
-
-    def test_node_arguments(self):
-        context = rclpy.context.Context()
-        rclpy.init(context=context)
-        try:
-            node = rclpy.create_node(
-                'my_node', namespace='/my_ns', cli_args=['__ns:=/foo/bar'], context=context)
-            self.assertEqual('/foo/bar', node.get_namespace())
-            node.destroy_node()
-        finally:
-            rclpy.shutdown(context=context)
+            # A new descriptor is always checked against the current value.
+            self.node.set_descriptor(
+                'in_range', ParameterDescriptor(integer_range=[self._INTEGER_RANGE_NO_STEP]))
+            apply_integer_range.assert_called_once()
+            apply_integer_range.reset_mock()
+
+            result = self.node.set_parameters([Parameter('in_range', value=4)])
+            self.assertTrue(result[0].successful)
+            apply_integer_range.assert_not_called()
+
+            # The stored value is still checked against a descriptor that isn't the stored one.
+            result = self.node._apply_descriptor(
+                Parameter('in_range', value=4),
+                ParameterDescriptor(integer_range=[self._INTEGER_RANGE_LARGE_STEP]))
+            self.assertFalse(result.successful)
+            apply_integer_range.assert_called_once()
+            apply_integer_range.reset_mock()
+
+            # Other values are still checked.
+            result = self.node.set_parameters([Parameter('in_range', value=5)])
+            self.assertTrue(result[0].successful)
+            apply_integer_range.assert_called_once()
+        self.assertEqual(self.node.get_parameter('in_range').value, 5)
+
+
+@pytest.mark.parametrize('kwargs,expected_name,expected_namespace', [
+    ({'use_global_arguments': True}, 'global_node_name', '/my_ns'),
+    ({'use_global_arguments': False}, 'my_node', '/my_ns'),
+    ({'cli_args': ['__ns:=/foo/bar']}, 'global_node_name', '/foo/bar'),
+])
+def test_node_arguments(kwargs, expected_name, expected_namespace):
+    # Global arguments only apply to nodes created with use_global_arguments=True (the default),
+    # so every case can share this context.
+    context = _get_context(('process_name', '__node:=global_node_name'))
+    node = Node('my_node', namespace='/my_ns', context=context, **kwargs)
+    try:
+        assert expected_name == node.get_name()
+        assert expected_namespace == node.get_namespace()
+    finally:
+        node.destroy_node()
 
 
 if __name__ == '__main__':
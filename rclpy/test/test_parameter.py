@@ -112,6 +112,18 @@ class TestParameter(unittest.TestCase):
         self.assertIsNone(p.value)
         self.assertEqual(p.type_, Parameter.Type.NOT_SET)
 
+    def test_type_from_value_subclass(self):
+        class MyInt(int):
+            pass
+
+        p = Parameter('myparam', value=MyInt(42))
+        self.assertEqual(p.type_, Parameter.Type.INTEGER)
+
+    def test_no_instance_dict(self):
+        p = Parameter('myparam', value=42)
+        with self.assertRaises(AttributeError):
+            p.extra_attribute = 'not allowed'
+
     def test_value_and_type_must_agree(self):
         with self.assertRaises(ValueError):
             Parameter('myparam', Parameter.Type.NOT_SET, 42)